@@ -1,8 +1,14 @@
 import os
+import stat
+import tempfile
+from collections import Counter
+from dataclasses import dataclass
+from operator import attrgetter
+from types import MappingProxyType
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.express as px
-import matplotlib.pyplot as plt
+import pyarrow as pa
 
 # -----------------------------------------------------------
 # 1️⃣ APP CONFIGURATION
@@ -16,88 +22,372 @@ page = st.sidebar.radio("Go to", ["Dashboard", "Farmer Input", "Evaluation"])
 # -----------------------------------------------------------
 # 2️⃣ LOAD DATASET (robust)
 # -----------------------------------------------------------
-@st.cache_data
-def load_data():
-    """Try several candidate locations for the dataset.
-    If none are found, show a warning and return an empty DataFrame
-    with the columns the dashboard expects to avoid crashing.
+# Expected dataset schema; declaring it up front skips pandas' type inference.
+# The pyarrow engine parses the file multithreaded straight into columnar buffers.
+# Columns missing from the file are skipped, so each parameter degrades on its own.
+DTYPES = {
+    "ph": np.float32,
+    "Temperature": np.float32,
+    "Dissolved_Oxygen": np.float32,
+    "Ammonia": np.float32,
+}
+
+
+def empty_dataset():
+    """Empty frame with the expected columns, so describe() and the per-column guards still work."""
+    return pd.DataFrame(columns=list(DTYPES)).astype(DTYPES)
+
+# Files above this size are read in bounded chunks instead of in one pass
+CHUNKED_READ_BYTES = 256 * 1024 * 1024
+CHUNK_ROWS = 100_000
+
+
+def read_csv_columns(p, usecols, dtype=None, engine="pyarrow"):
+    """Read ``usecols`` from the CSV at ``p``, in chunks when the file is large."""
+    if os.path.getsize(p) <= CHUNKED_READ_BYTES:
+        return pd.read_csv(p, dtype=dtype, usecols=usecols, engine=engine)
+    reader = pd.read_csv(p, dtype=dtype, usecols=usecols, engine="c", chunksize=CHUNK_ROWS)
+    return pd.concat(reader, ignore_index=True, copy=False)
+
+
+def read_dataset(p):
+    """Read the CSV at ``p`` with the expected schema.
+    A Parquet copy is kept next to the CSV and preferred while it is at least
+    as new as the CSV, so cold load_data cache misses skip text parsing.
+    Large files are streamed in chunks (the pyarrow engine cannot chunk),
+    so the parser never holds more than ``CHUNK_ROWS`` raw rows at once.
+    """
+    pq = os.path.splitext(p)[0] + ".parquet"
+    if os.path.exists(pq) and os.path.getmtime(pq) >= os.path.getmtime(p):
+        try:
+            return pd.read_parquet(pq)
+        except Exception:
+            # Unreadable copy — fall through and rebuild it from the CSV
+            pass
+
+    header = pd.read_csv(p, nrows=0).columns
+    present = [c for c in DTYPES if c in header]
+    if not present:
+        return empty_dataset()
+
+    try:
+        df = read_csv_columns(p, present, {c: DTYPES[c] for c in present})
+    except ValueError:
+        # Non-numeric entries or ragged rows: read untyped with the lenient C parser
+        # and blank out the bad values instead of dropping the whole dataset
+        df = read_csv_columns(p, present, engine="c")
+        df = df.apply(pd.to_numeric, errors="coerce").astype({c: DTYPES[c] for c in present})
+
+    write_parquet_atomic(df, pq, stat.S_IMODE(os.stat(p).st_mode))
+    return df
+
+
+def write_parquet_atomic(df, pq, mode):
+    """Write ``df`` to ``pq`` via a temp file so readers never see a partial file.
+    The copy gets permission bits ``mode`` (the CSV's) rather than mkstemp's 0600.
+    """
+    try:
+        fd, tmp = tempfile.mkstemp(suffix=".parquet", dir=os.path.dirname(pq) or ".")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                df.to_parquet(f, index=False)
+            os.chmod(tmp, mode)
+            os.replace(tmp, pq)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    except (OSError, pa.ArrowException):
+        # Read-only checkout or full disk — the CSV is still usable, just not cached
+        pass
+
+
+CANDIDATES = (
+    "water.csv",
+    os.path.join("data", "water.csv"),
+    os.path.join(os.path.dirname(__file__), "data", "water.csv"),
+    os.path.join(os.path.dirname(__file__), "water.csv"),
+)
+
+
+@st.cache_resource
+def find_dataset_path():
+    """Return the first candidate location that exists.
+    Found once per process so reruns and load_data cache misses don't re-stat the filesystem.
+    Raises FileNotFoundError when there is none; Streamlit doesn't cache exceptions,
+    so a missing file is looked for again on the next rerun.
+    """
+    p = next((p for p in CANDIDATES if p and os.path.exists(p)), None)
+    if p is None:
+        raise FileNotFoundError("water.csv")
+    return p
+
+
+def resolve_dataset_path():
+    """Return the dataset location, or None if it hasn't been added yet."""
+    try:
+        return find_dataset_path()
+    except FileNotFoundError:
+        return None
+
+
+@st.cache_data(persist="disk", show_spinner=False)
+def load_data(p, mtime):
+    """Load the dataset found at ``p``.
+    ``mtime`` is only part of the cache key, so editing the CSV invalidates the
+    persisted copy. Read errors propagate and are therefore never cached.
     """
-    candidates = [
-        "water.csv",
-        os.path.join("data", "water.csv"),
-        os.path.join(os.path.dirname(__file__), "data", "water.csv"),
-        os.path.join(os.path.dirname(__file__), "water.csv"),
-    ]
-
-    for p in candidates:
-        if p and os.path.exists(p):
-            try:
-                df = pd.read_csv(p)
-                return df
-            except Exception as e:
-                st.error(f"Found dataset at {p} but failed to read it: {e}")
-                return pd.DataFrame()
+    return read_dataset(p)
+
+
+def get_dataset():
+    """Load the dataset if one was found, with a ``(path, mtime)`` version key.
+    On a read error or a missing file, show a message and return an empty
+    DataFrame (and a None version) so the dashboard doesn't crash.
+    """
+    p = resolve_dataset_path()
+    if p is not None:
+        try:
+            version = (p, os.path.getmtime(p))
+            return load_data(*version), version
+        except Exception as e:
+            st.error(f"Found dataset at {p} but failed to read it: {e}")
+            return empty_dataset(), None
 
     # No dataset found — inform the user and return an empty DataFrame with expected columns
     st.warning(
-        "Dataset file not found. Place 'water_potability.csv' in the project root or 'data/water.csv'. "
+        "Dataset file not found. Place 'water.csv' in the project root or 'data/water.csv'. "
         "Dashboard will show an empty dataset until a file is added."
     )
-    columns = ["ph", "Temperature", "Dissolved_Oxygen", "Ammonia"]
-    return pd.DataFrame(columns=columns)
+    return empty_dataset(), None
+
+
+@st.cache_data
+def cached_describe(df):
+    """Summary statistics for the dataset, memoized across reruns."""
+    return df.describe()
+
+
+@st.cache_data
+def compute_histogram(series, bins=20):
+    """Bin the (non-null) ``series`` into ``bins`` equal-width buckets.
+    Cached so reruns that don't change the selected column skip the binning pass.
+    """
+    # Bin in float64: float32 edges carry noise that rounding can't strip from the labels
+    counts, edges = np.histogram(series.to_numpy(dtype=float), bins=bins)
+    # Round labels to one digit finer than the bin width so neighbouring bins never share a label
+    decimals = max(0, int(np.ceil(-np.log10(edges[1] - edges[0]))) + 1)
+    return pd.DataFrame({"Frequency": counts}, index=np.round(edges[:-1], decimals))
 
 
-df = load_data()
+df, dataset_version = get_dataset()
 
 # Map friendly display names to DataFrame column names (datasets often use different keys)
-DISPLAY_TO_DF = {
+DISPLAY_TO_DF = MappingProxyType({
     "pH": "ph",
     "Temperature": "Temperature",
     "Dissolved Oxygen": "Dissolved_Oxygen",
     "Ammonia": "Ammonia",
-}
-
-# -----------------------------------------------------------
-# 3️⃣ DASHBOARD SECTION
-# -----------------------------------------------------------
-if page == "Dashboard":
-    st.subheader("📊 Pond Water Quality Dashboard")
-    st.write("This dashboard visualizes water quality parameters affecting fish health.")
+})
+
+# Safe range definitions
+SAFE_RANGES = MappingProxyType({
+    "Temperature": (25, 30),
+    "Dissolved Oxygen": (5, 10),
+    "pH": (6.5, 8.5),
+    "Ammonia": (0, 0.05)
+})
+
+# Same ranges as parallel arrays so every parameter is checked in one vectorized pass
+SAFE_PARAMS = np.array(list(SAFE_RANGES))
+SAFE_LOWS = np.array([low for low, _ in SAFE_RANGES.values()], dtype=float)
+SAFE_HIGHS = np.array([high for _, high in SAFE_RANGES.values()], dtype=float)
+AMMONIA_RISKY_MAX = 0.1
+AMMONIA_MASK = SAFE_PARAMS == "Ammonia"
+AMMONIA_BINS = [SAFE_RANGES["Ammonia"][1], AMMONIA_RISKY_MAX]
+
+# Row 0 grades ordinary parameters, row 1 grades Ammonia; columns are bucket indices
+STATUS_TABLE = np.array([
+    ["Low", "Safe", "High"],
+    ["Safe", "Risky", "Unsafe"],
+])
+
+# PondInputs field holding each parameter's reading
+INPUT_FIELDS = MappingProxyType({
+    "Temperature": "temperature",
+    "Dissolved Oxygen": "do",
+    "pH": "ph",
+    "Ammonia": "ammonia",
+})
+# Fetches a PondInputs' readings as a tuple in SAFE_PARAMS order
+get_readings = attrgetter(*(INPUT_FIELDS[p] for p in SAFE_PARAMS.tolist()))
+
+
+@dataclass(slots=True)
+class PondInputs:
+    """Readings submitted through the Farmer Input form."""
+    temperature: float
+    do: float
+    ammonia: float
+    ph: float
+
+    def readings(self):
+        """Readings keyed by their display names, in SAFE_PARAMS order."""
+        return dict(zip(SAFE_PARAMS.tolist(), get_readings(self)))
+
+    def as_array(self):
+        """Readings as a float array in SAFE_PARAMS order."""
+        return np.array(get_readings(self), dtype=float)
+
+
+def evaluate_status(data):
+    """Classify each entered reading against its safe range.
+    Ammonia has no lower bound and is graded Safe/Risky/Unsafe; every other
+    parameter is graded Low/Safe/High. Each reading is bucketed without
+    branching and the bucket index is looked up in STATUS_TABLE.
+    """
+    vals = data.as_array()
+    idx = np.where(
+        AMMONIA_MASK,
+        np.digitize(vals, AMMONIA_BINS, right=True),
+        (vals >= SAFE_LOWS).astype(int) + (vals > SAFE_HIGHS),
+    )
+    statuses = STATUS_TABLE[AMMONIA_MASK.astype(int), idx]
+    return dict(zip(SAFE_PARAMS.tolist(), statuses.tolist()))
+
+
+STATUS_COLORS = MappingProxyType({
+    "Safe": "green",
+    "Low": "orange",
+    "High": "red",
+    "Risky": "orange",
+    "Unsafe": "red"
+})
+
+
+# Evaluation charts are read-only summaries; rendering them static drops the mode bar and interaction JS
+STATIC_PLOT_CONFIG = {"displayModeBar": False, "staticPlot": True}
+
+
+# Figure builders are cached so identical inputs skip rebuilding the Figure.
+# Plotly is imported inside them, so it only loads on the first cache miss.
+# The box plot is shared dataset-wide and keyed on the dataset version rather than
+# hashing the column; the per-submission charts use cache_data so each caller gets a copy.
+@st.cache_resource(max_entries=len(DISPLAY_TO_DF))
+def make_box(_series, parameter, dataset_version):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Box(y=_series, name=_series.name, marker_color="teal"))
+    fig.update_layout(title=f"{parameter} Variation (Box Plot)", yaxis_title=_series.name)
+    return fig
+
+
+@st.cache_data(max_entries=64)
+def make_pie(labels, values):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Pie(
+        labels=labels,
+        values=values,
+        marker=dict(colors=[STATUS_COLORS[s] for s in labels]),
+    ))
+    fig.update_layout(title="Pond Condition Status")
+    return fig
+
+
+@st.cache_data(max_entries=64)
+def make_bar(params, values, statuses):
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    # One trace per status keeps the colour legend Plotly Express used to draw
+    for s in dict.fromkeys(statuses):
+        idx = [i for i, v in enumerate(statuses) if v == s]
+        fig.add_trace(go.Bar(
+            x=[params[i] for i in idx],
+            y=[values[i] for i in idx],
+            name=s,
+            marker_color=STATUS_COLORS[s],
+            text=[values[i] for i in idx],
+            textposition="auto",
+        ))
+    fig.update_layout(
+        title="Parameter Comparison with Ideal Range",
+        xaxis_title="Parameter",
+        yaxis_title="Value",
+        legend_title_text="Status",
+        barmode="relative",
+    )
+    return fig
 
-    st.write("### Dataset Summary")
-    st.dataframe(df.describe())
 
+# Fragments rerun on their own when a widget inside them changes, skipping the rest of the page
+@st.fragment
+def _dashboard_plots(df, dataset_version):
+    """Parameter picker and its plots; changing the selection reruns only this block."""
     # Parameter selection for visualization
     parameter = st.selectbox(
         "Select parameter to visualize",
         list(DISPLAY_TO_DF.keys())
     )
 
+    df_col = DISPLAY_TO_DF.get(parameter, parameter)
+    series = df[df_col].dropna() if df_col in df.columns else None
+    has_data = series is not None and not series.empty
+
     col1, col2 = st.columns(2)
 
     with col1:
-        # Histogram
         # Histogram (only plot if there is data)
-        df_col = DISPLAY_TO_DF.get(parameter, parameter)
-        if df_col not in df.columns or df[df_col].dropna().empty:
+        if not has_data:
             st.info(f"No data available yet for {parameter} — add readings to see the distribution.")
         else:
-            fig, ax = plt.subplots()
-            ax.hist(df[df_col].dropna(), bins=20, color="skyblue", edgecolor="black")
-            ax.set_title(f"{parameter} Distribution")
-            ax.set_xlabel(parameter)
-            ax.set_ylabel("Frequency")
-            st.pyplot(fig)
+            st.write(f"**{parameter} Distribution**")
+            st.bar_chart(compute_histogram(series), color="#87ceeb", x_label=parameter, y_label="Frequency")
 
     with col2:
         # Box plot for the same parameter (only plot if there is data)
-        df_col = DISPLAY_TO_DF.get(parameter, parameter)
-        if df_col not in df.columns or df[df_col].dropna().empty:
+        if not has_data:
             st.info(f"No data available yet for {parameter} — add readings to see the box plot.")
         else:
-            fig_box = px.box(df, y=df_col, title=f"{parameter} Variation (Box Plot)", color_discrete_sequence=["teal"])
+            fig_box = make_box(series, parameter, dataset_version)
             st.plotly_chart(fig_box, use_container_width=True)
 
+
+def _evaluation_charts(readings, status):
+    """Status pie and value bar charts for the evaluated readings."""
+    params = tuple(status)
+    values = tuple(readings[p] for p in params)
+    statuses = tuple(status.values())
+
+    # ------------------------------
+    # PIE CHART (SAFE vs UNSAFE)
+    # ------------------------------
+    st.subheader("📈 Water Quality Overview")
+
+    status_counts = Counter(statuses)
+
+    fig_pie = make_pie(tuple(status_counts), tuple(status_counts.values()))
+    st.plotly_chart(fig_pie, use_container_width=True, theme=None, config=STATIC_PLOT_CONFIG)
+
+    # ------------------------------
+    # BAR CHART (VALUES vs IDEAL RANGE)
+    # ------------------------------
+    fig_bar = make_bar(params, values, statuses)
+    st.plotly_chart(fig_bar, use_container_width=True, theme=None, config=STATIC_PLOT_CONFIG)
+
+
+# -----------------------------------------------------------
+# 3️⃣ DASHBOARD SECTION
+# -----------------------------------------------------------
+if page == "Dashboard":
+    st.subheader("📊 Pond Water Quality Dashboard")
+    st.write("This dashboard visualizes water quality parameters affecting fish health.")
+
+    st.write("### Dataset Summary")
+    st.dataframe(cached_describe(df))
+
+    _dashboard_plots(df, dataset_version)
+
     st.success("✅ Dashboard loaded successfully!")
 
 # -----------------------------------------------------------
@@ -115,8 +405,7 @@ elif page == "Farmer Input":
         submitted = st.form_submit_button("Analyze Pond Water")
 
     if submitted:
-        # Use display-friendly keys that match evaluation safe_ranges (e.g. 'Dissolved Oxygen')
-        st.session_state["inputs"] = {"Temperature": temp, "Dissolved Oxygen": do, "Ammonia": ammonia, "pH": ph}
+        st.session_state["inputs"] = PondInputs(temp, do, ammonia, ph)
         st.success("✅ Data submitted successfully! Go to 'Evaluation' to see results.")
         st.balloons()
 
@@ -130,93 +419,14 @@ elif page == "Evaluation":
         st.warning("Please enter data in the 'Farmer Input' section first.")
     else:
         data = st.session_state["inputs"]
+        readings = data.readings()
 
         st.write("### Entered Data")
-        st.write(pd.DataFrame([data]))
-
-        # Safe range definitions
-        safe_ranges = {
-            "Temperature": (25, 30),
-            "Dissolved Oxygen": (5, 10),
-            "pH": (6.5, 8.5),
-            "Ammonia": (0, 0.05)
-        }
-
-        # Check function
-        def check_status(param, value):
-            low, high = safe_ranges[param]
-            if param == "Ammonia":
-                if value <= high:
-                    return "Safe"
-                elif value <= 0.1:
-                    return "Risky"
-                else:
-                    return "Unsafe"
-            elif value < low:
-                return "Low"
-            elif value > high:
-                return "High"
-            else:
-                return "Safe"
-
-        status = {param: check_status(param, val) for param, val in data.items()}
-
-        # Convert to DataFrame for visualization
-        df_eval = pd.DataFrame({
-            "Parameter": list(data.keys()),
-            "Value": list(data.values()),
-            "Status": list(status.values())
-        })
+        st.write(pd.DataFrame([readings]))
 
-        # ------------------------------
-        # PIE CHART (SAFE vs UNSAFE)
-        # ------------------------------
-        st.subheader("📈 Interactive Water Quality Dashboard")
-
-        status_counts = df_eval["Status"].value_counts().reset_index()
-        status_counts.columns = ["Status", "Count"]
-
-        fig_pie = px.pie(
-            status_counts,
-            names="Status",
-            values="Count",
-            title="Pond Condition Status",
-            color="Status",
-            color_discrete_map={
-                "Safe": "green",
-                "Low": "orange",
-                "High": "red",
-                "Risky": "orange",
-                "Unsafe": "red"
-            }
-        )
-        st.plotly_chart(fig_pie, use_container_width=True)
+        status = evaluate_status(data)
 
-        # ------------------------------
-        # BAR CHART (VALUES vs IDEAL RANGE)
-        # ------------------------------
-        ideal_min = [safe_ranges[p][0] for p in df_eval["Parameter"]]
-        ideal_max = [safe_ranges[p][1] for p in df_eval["Parameter"]]
-
-        df_eval["Ideal Min"] = ideal_min
-        df_eval["Ideal Max"] = ideal_max
-
-        fig_bar = px.bar(
-            df_eval,
-            x="Parameter",
-            y="Value",
-            color="Status",
-            text_auto=True,
-            title="Parameter Comparison with Ideal Range",
-            color_discrete_map={
-                "Safe": "green",
-                "Low": "orange",
-                "High": "red",
-                "Risky": "orange",
-                "Unsafe": "red"
-            }
-        )
-        st.plotly_chart(fig_bar, use_container_width=True)
+        _evaluation_charts(readings, status)
 
         # ------------------------------
         # RECOMMENDATIONS SECTION
@@ -224,7 +434,7 @@ elif page == "Evaluation":
         st.subheader("🧠 Recommendations & Analysis")
 
         for param, s in status.items():
-            val = data[param]
+            val = readings[param]
             if s == "Safe":
                 st.success(f"✅ {param} = {val} → Within safe range.")
             elif s in ["Low", "Risky"]: